@@ -11,30 +11,25 @@ Date: 2025-10-09
 
 import os
 import random
-from PIL import Image, ImageDraw
+import logging
 from datetime import datetime
-import colorlog
 import uuid
 
 # Local module imports
 from utils import ensure_dir
 import layer_styles
+import encoders
 
-# Configure colorlog
-handler = colorlog.StreamHandler()
-handler.setFormatter(colorlog.ColoredFormatter(
-    '%(log_color)s[%(levelname)s] %(message)s',
-    log_colors={
-        'DEBUG': 'cyan',
-        'INFO': 'green',
-        'WARNING': 'yellow',
-        'ERROR': 'red',
-        'CRITICAL': 'bold_red',
-    }
-))
-logger = colorlog.getLogger('ArtGenerator')
-logger.addHandler(handler)
-logger.setLevel('INFO')
+# PIL, and NumPy for the optional wobble and texture passes, are imported
+# where they are first needed so that short-lived processes start quickly.
+
+logger = logging.getLogger('AlponaGen.ArtGenerator')
+
+# Base colours of every design; the palette encoder is derived from them.
+COLORS = {
+    "white": (245, 245, 240),
+    "clay": (110, 60, 40),
+}
 
 # ----------------------------------------------------------------------
 # Art Generator Class
@@ -46,15 +41,60 @@ class ArtGenerator:
     
     Available styles: `alpona`
 
+    `tolerance` is the largest allowed distance, in pixels, between a drawn
+    curve and its polyline approximation. Larger values draw fewer vertices
+    (faster); smaller values give smoother curves on large images.
+
+    `wobble` is the amplitude, in pixels, of the hand-drawn displacement
+    applied to layer outlines (0 disables it). `wobble_layers` optionally
+    limits it to the named layer styles, e.g. {"draw_spiral", "draw_braid"}.
+
+    `texture` names a background texture from `textures.TEXTURE_KINDS`
+    ("paper" or "clay"); `texture_strength` is how strongly its grain
+    modulates the clay colour.
+
+    `motifs` adds the paisley, fish and flower motif layers to the filled
+    styles that `alpona` can pick.
+
+    `encoding` is one of `encoders.ENCODINGS` and `compress_level` its
+    compression effort from 0 (fastest) to 9 (smallest).
+
+    `plan_index` is an optional `plan_index.PlanIndex`. Alpona plans that
+    duplicate an indexed design are resampled (up to `max_attempts` times)
+    when `on_duplicate` is "resample", or skipped when it is "reject".
+    `generate` records a plan in the index only once its image is saved.
+
     Usage:
         gen = ArtGenerator(width=1024, height=1024, output_dir="output")
         gen.generate("alpona")
     """
 
-    def __init__(self, width=1024, height=1024, output_dir="output"):
+    def __init__(self, width=1024, height=1024, output_dir="output", tolerance=layer_styles.DEFAULT_TOLERANCE,
+                 wobble=0.0, wobble_layers=None, texture=None, texture_strength=0.15,
+                 motifs=False, encoding="png", compress_level=encoders.DEFAULT_LEVEL,
+                 plan_index=None, on_duplicate="resample", max_attempts=20):
         self.width = width
         self.height = height
         self.output_dir = output_dir
+        if not tolerance > 0:
+            raise ValueError(f"tolerance must be a positive number of pixels, got {tolerance}")
+        self.tolerance = tolerance
+        self.wobble = wobble
+        self.wobble_layers = wobble_layers
+        self.texture = texture
+        self.texture_strength = texture_strength
+        self.motifs = motifs
+        if encoding not in encoders.ENCODINGS:
+            raise ValueError(f"Unknown encoding: {encoding}")
+        self.encoding = encoding
+        self.compress_level = compress_level
+        if on_duplicate not in ("resample", "reject"):
+            raise ValueError(f"Unknown duplicate policy: {on_duplicate}")
+        if max_attempts < 1:
+            raise ValueError(f"max_attempts must be at least 1, got {max_attempts}")
+        self.plan_index = plan_index
+        self.on_duplicate = on_duplicate
+        self.max_attempts = max_attempts
         ensure_dir(output_dir)
         self.styles = {}
         self._register_builtin_styles()
@@ -72,61 +112,106 @@ class ArtGenerator:
             return func
         return decorator
 
+    @classmethod
+    def _builtin_style_names(cls):
+        """Names of the `style_*` methods of the class, collected once per class."""
+        if "_style_names" not in cls.__dict__:
+            cls._style_names = [name for name in dir(cls) if name.startswith("style_")]
+        return cls._style_names
+
     def _register_builtin_styles(self):
         """Register all internal style methods."""
-        for name in dir(self):
-            if name.startswith("style_"):
-                func = getattr(self, name)
-                self.styles[name.replace("style_", "")] = func
-                logger.info(f"Builtin style registered: {name.replace('style_', '')}")
+        for name in self._builtin_style_names():
+            self.styles[name.replace("style_", "")] = getattr(self, name)
+            logger.debug(f"Builtin style registered: {name.replace('style_', '')}")
 
     # ------------------------------------------------------------------
     # Main Generation Entry Point
     # ------------------------------------------------------------------
 
-    def generate(self, style_name=None, id = str(uuid.uuid1())):
+    def _unique_alpona_plan(self, id):
         """
-        Generate one art image and save to output directory.
+        Pick an alpona plan that is not a duplicate in `self.plan_index`.
+        Entries recorded under `id` itself are ignored, so a seed resumed
+        after a crash does not match its own earlier entry. Returns None
+        if the design is rejected.
+        """
+        for attempt in range(self.max_attempts):
+            plan = self.plan_alpona()
+            duplicate_of = self.plan_index.find(plan, exclude_id=id)
+            if duplicate_of is None:
+                break
+            if self.on_duplicate == "reject":
+                logger.warning(f"Design {id} duplicates {duplicate_of}; rejected.")
+                return None
+            logger.info(f"Design {id} duplicates {duplicate_of}; resampling ({attempt + 1}/{self.max_attempts}).")
+        else:
+            logger.warning(f"No unique design found for {id} in {self.max_attempts} attempts; keeping the last one.")
+        return plan
+
+    def render(self, style_name=None, seed=None, id=None):
+        """
+        Draw one art image in memory and return it as an RGBA `Image`.
+        If `seed` is given the random state is reset first, so the same
+        seed always produces the same image. Returns None if a plan index
+        is set and the design was rejected as a duplicate.
         """
+        return self._render(style_name, seed, id)[0]
+
+    def _render(self, style_name, seed, id):
+        """`render`, returning `(image, plan)`; `plan` is None unless a plan index picked it."""
+        if seed is not None:
+            random.seed(seed)
+
         if not style_name or style_name not in self.styles:
             logger.info("No style specified. Choosing a random style.")
             style_name = random.choice(list(self.styles.keys()))
-        
-        logger.critical(f"Generating image with id = {id}")
+
         logger.info(f"Generating style: {style_name}")
 
+        kwargs = {}
+        if style_name == "alpona" and self.plan_index is not None:
+            kwargs["plan"] = self._unique_alpona_plan(id)
+            if kwargs["plan"] is None:
+                return None, None
+
+        from PIL import Image, ImageDraw
+
         img = Image.new("RGBA", (self.width, self.height), (0, 0, 0, 255))
         draw = ImageDraw.Draw(img, "RGBA")
 
-        self.styles[style_name](draw)
+        self.styles[style_name](draw, **kwargs)
+        return img, kwargs.get("plan")
+
+    def generate(self, style_name=None, id = str(uuid.uuid1()), seed=None):
+        """
+        Generate one art image and save to output directory.
+        See `render` for `seed`. Returns the saved filename, or None if the
+        design was rejected as a duplicate.
+        """
+        logger.critical(f"Generating image with id = {id}")
+        img, plan = self._render(style_name, seed, id)
+        if img is None:
+            return None
 
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
-        filename = os.path.join(self.output_dir, f"image_{id}.png")
-        img.save(filename, "PNG")
+        filename = os.path.join(self.output_dir, f"image_{id}.{encoders.EXTENSIONS[self.encoding]}")
+        encoders.encode(img, filename, self.encoding, self.compress_level, palette=(COLORS["clay"], COLORS["white"]))
         logger.info(f"Image saved: {filename}")
+        if plan is not None:
+            self.plan_index.add(plan, id)
+        return filename
 
     # ------------------------------------------------------------------
     # Style Implementations
     # ------------------------------------------------------------------
 
-    def style_alpona(self, draw):
+    def plan_alpona(self):
         """
-        Generate an intricate Alpona/Rangoli-inspired circular design.
-        The algorithm prioritizes 'filled' layers, ensures symmetrical patterns,
-        and makes outlined layers more prominent with thicker lines.
+        Pick the layer sequence of an alpona design without drawing anything.
+        Returns the list of layer style functions, innermost layer first.
         """
-        center = (self.width // 2, self.height // 2)
         n_layers = random.randint(15, 25)
-        base_radius = min(self.width, self.height) // 2.2
-        
-        # Environment dictionary to pass common parameters to pattern functions
-        environment = {
-            "center": center,
-            "white": (245, 245, 240),
-            "clay": (110, 60, 40)
-        }
-
-        draw.rectangle([0, 0, self.width, self.height], fill=environment["clay"])
 
         # Categorize styles from the patterns module
         filled_styles = [
@@ -147,18 +232,21 @@ class ArtGenerator:
             layer_styles.draw_concentric_rings,
             layer_styles.draw_lotus_petals_outlined,
         ]
-        
+        if self.motifs:
+            filled_styles += [
+                layer_styles.draw_paisley_ring, layer_styles.draw_fish_ring,
+                layer_styles.draw_flower_ring,
+            ]
+
         # ------------------------------------------------------------------
-        # Draw concentric layers with logic that prioritizes filling
+        # Choose concentric layers with logic that prioritizes filling
         # ------------------------------------------------------------------
 
         last_layer_was_filled = False # want the first layer to be filled, hence driving the motivation
         last_layer_style = None
+        plan = []
 
         for i in range(n_layers):
-            inner_r = base_radius * (i / n_layers)
-            outer_r = base_radius * ((i + 1) / n_layers)
-
             if i == 0:
                 style = random.choice([layer_styles.draw_spiral, 
                                        # layer_styles.draw_dots, 
@@ -186,14 +274,71 @@ class ArtGenerator:
                         last_layer_was_filled = False
 
             last_layer_style = style
+            plan.append(style)
+
+        return plan
+
+    def style_alpona(self, draw, plan=None):
+        """
+        Generate an intricate Alpona/Rangoli-inspired circular design.
+        The algorithm prioritizes 'filled' layers, ensures symmetrical patterns,
+        and makes outlined layers more prominent with thicker lines.
+        `plan` is a layer sequence from `plan_alpona`; a new one is picked if
+        it is not given.
+        """
+        if plan is None:
+            plan = self.plan_alpona()
+
+        center = (self.width // 2, self.height // 2)
+        n_layers = len(plan)
+        base_radius = min(self.width, self.height) // 2.2
+        
+        # Environment dictionary to pass common parameters to pattern functions
+        environment = {
+            "center": center,
+            "white": COLORS["white"],
+            "clay": COLORS["clay"],
+            "tolerance": self.tolerance,
+        }
+
+        if self.texture:
+            import textures
+            textures.draw_texture(draw, self.width, self.height, self.texture, environment["clay"], self.texture_strength)
+        else:
+            draw.rectangle([0, 0, self.width, self.height], fill=environment["clay"])
+
+        # ------------------------------------------------------------------
+        # Draw concentric layers
+        # ------------------------------------------------------------------
+
+        # Consecutive wobbled layers share one buffer, so their vertices are
+        # displaced together when a plain layer (or the end) flushes it.
+        wobble_draw = None
+        if self.wobble:
+            from wobble import WobbleDraw, random_offset
+            wobble_draw = WobbleDraw(draw, self.wobble, offset=random_offset())
+
+        for i, style in enumerate(plan):
+            inner_r = base_radius * (i / n_layers)
+            outer_r = base_radius * ((i + 1) / n_layers)
 
             logger.info(f"Layer {i + 1}/{n_layers}: Using style {style.__name__}")
 
+            layer_draw = draw
+            if wobble_draw is not None:
+                if self.wobble_layers is None or style.__name__ in self.wobble_layers:
+                    layer_draw = wobble_draw
+                else:
+                    wobble_draw.flush()
+
             # Call the selected style function from the patterns module
-            style(draw=draw, environment=environment, inner_r=inner_r, outer_r=outer_r)
+            style(draw=layer_draw, environment=environment, inner_r=inner_r, outer_r=outer_r)
 
             # Draw the boundary circle for the layer
-            draw.ellipse(
+            layer_draw.ellipse(
                 (center[0] - outer_r, center[1] - outer_r, center[0] + outer_r, center[1] + outer_r),
                 outline=environment["white"] + (180,), width=random.randint(1, 3)
-            )
\ No newline at end of file
+            )
+
+        if wobble_draw is not None:
+            wobble_draw.flush()
\ No newline at end of file
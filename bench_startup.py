@@ -0,0 +1,92 @@
+"""
+AlponaGen v1.1
+---------------------
+Startup-time benchmark with a time budget.
+
+The GUI runs `main.py` in a fresh process per click, and batch workers and
+container jobs are short-lived, so interpreter start plus imports is paid
+over and over. This script times those cold starts in fresh subprocesses,
+checks that importing the engine does not pull in the heavy optional
+dependencies, and exits non-zero when a budget is exceeded.
+tests/test_startup.py runs the same checks under pytest with looser budgets.
+
+Usage:
+    python bench_startup.py                  # default budgets
+    python bench_startup.py --scale 2.0      # looser budgets for slow machines
+
+Author: Aritro Shome
+Date: 2025-10-09
+"""
+
+import os
+import sys
+import time
+import tempfile
+import argparse
+import statistics
+import subprocess
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+# Modules that must not be loaded just by importing the engine and CLI.
+LAZY_MODULES = ("numpy", "PIL", "colorlog")
+
+# (name, command, budget in seconds for the median run)
+CASES = [
+    ("python startup", [sys.executable, "-c", "pass"], None),
+    ("import main", [sys.executable, "-c", "import main"], 0.15),
+    ("main.py --version", [sys.executable, "main.py", "--version"], 0.2),
+    ("main.py one 64px image", [sys.executable, "main.py", "-c", "1", "-w", "64", "-ht", "64", "-out", "{tmp}"], 0.5),
+]
+
+
+def time_command(command, runs):
+    """Median wall time in seconds of `runs` fresh runs of `command`."""
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(command, cwd=HERE, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def eagerly_imported():
+    """Return the LAZY_MODULES that `import main` loads in a fresh interpreter."""
+    probe = f"import sys, main; print(' '.join(m for m in {LAZY_MODULES!r} if m in sys.modules))"
+    result = subprocess.run([sys.executable, "-c", probe], cwd=HERE, check=True, capture_output=True, text=True)
+    return result.stdout.split()
+
+
+def time_cases(runs=5, scale=1.0):
+    """
+    Time every case of CASES. Returns a list of `(name, median, limit)` in
+    seconds, where `limit` is the budget times `scale` (None if unbudgeted).
+    """
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, command, budget in CASES:
+            median = time_command([part.format(tmp=tmp) for part in command], runs)
+            results.append((name, median, None if budget is None else budget * scale))
+    return results
+
+
+if __name__ == "__main__":
+    argparser = argparse.ArgumentParser("AlponaGen startup benchmark")
+    argparser.add_argument("-n", "--runs", type=int, default=5, help="Runs per case; the median is reported.")
+    argparser.add_argument("--scale", type=float, default=1.0, help="Multiply every budget by this factor.")
+    args = argparser.parse_args()
+
+    failures = []
+    print(f"{'case':<24} {'median ms':>10} {'budget ms':>10}")
+    for name, median, limit in time_cases(args.runs, args.scale):
+        print(f"{name:<24} {median * 1000:>10.1f} {'-' if limit is None else f'{limit * 1000:.0f}':>10}")
+        if limit is not None and median > limit:
+            failures.append(f"{name} took {median * 1000:.1f} ms (budget {limit * 1000:.0f} ms)")
+
+    eager = eagerly_imported()
+    if eager:
+        failures.append(f"import main loads {', '.join(eager)} eagerly")
+
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    raise SystemExit(1 if failures else 0)
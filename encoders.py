@@ -0,0 +1,152 @@
+"""
+AlponaGen v1.1
+---------------------
+Compact image encoders.
+
+The renderer draws translucent ink with `ImageDraw.Draw(img, "RGBA")` on an
+RGBA canvas, which writes the ink's alpha into the pixels instead of
+blending it, so a render holds only the clay and white colours at a few
+alpha levels. The original RGBA PNG keeps those pixels as they are and
+leaves the blending to whatever the image is viewed over.
+
+Every other encoding first flattens the image over an opaque background
+(the clay colour) with `Image.alpha_composite`. After that, with the flat
+background, every pixel lies on the line between the background colour and
+the ink colour, so `generate` can store it as:
+
+    png          RGBA PNG, unflattened (the original format)
+    png-rgb      flattened RGB PNG
+    png-palette  flattened 8-bit PNG with a fixed 256-entry palette along
+                 the background -> ink line (exact for flat backgrounds;
+                 textured ones are projected onto the line)
+    webp         flattened lossless WebP
+
+The flattened encodings are therefore lossless with respect to the
+flattened image, not to the RGBA `png` output: translucent pixels are
+stored as they look over the clay background.
+
+`level` is the compression effort from 0 (fastest) to 9 (smallest): the
+zlib level for PNG, mapped onto WebP's 0-6 method scale.
+
+Usage:
+    python encoders.py -n 10 -w 1024     # benchmark every encoding
+
+Author: Aritro Shome
+Date: 2025-10-09
+"""
+
+import io
+import time
+import argparse
+
+ENCODINGS = ("png", "png-rgb", "png-palette", "webp")
+EXTENSIONS = {"png": "png", "png-rgb": "png", "png-palette": "png", "webp": "webp"}
+DEFAULT_LEVEL = 6
+
+_palettes = {}
+
+
+def palette_colors(background, ink, levels=256):
+    """
+    Return the flat RGB palette of `levels` colours evenly spaced from
+    `background` to `ink`, i.e. every opacity of the ink over the background.
+    """
+    key = (tuple(background), tuple(ink), levels)
+    if key not in _palettes:
+        colors = []
+        for i in range(levels):
+            t = i / (levels - 1)
+            colors += [round(b + (k - b) * t) for b, k in zip(background, ink)]
+        _palettes[key] = colors + [0, 0, 0] * (256 - levels)
+    return _palettes[key]
+
+
+def palette_indices(flat, background, ink, levels=256):
+    """
+    Map every pixel of the RGB image `flat` to the nearest palette level by
+    projecting it onto the background -> ink line. Pillow's matrix convert
+    does the projection in one pass and returns the levels as an "L" image.
+    """
+    direction = [k - b for b, k in zip(background, ink)]
+    scale = (levels - 1) / sum(d * d for d in direction)
+    weights = [d * scale for d in direction]
+    offset = -sum(w * b for w, b in zip(weights, background))
+    return flat.convert("L", matrix=(*weights, offset))
+
+
+def flatten(img, background):
+    """Composite `img` over an opaque `background` colour and return it as an RGB image."""
+    from PIL import Image
+
+    if img.mode != "RGBA":
+        return img.convert("RGB")
+    canvas = Image.new("RGBA", img.size, tuple(background) + (255,))
+    return Image.alpha_composite(canvas, img).convert("RGB")
+
+
+def encode(img, fp, encoding="png", level=DEFAULT_LEVEL, palette=None):
+    """
+    Write `img` to `fp` (a filename or file object) with `encoding`.
+    `palette` is the `(background, ink)` colour pair. Every encoding but
+    "png" needs it: the image is flattened over the background first.
+    """
+    if encoding == "png":
+        img.save(fp, "PNG", compress_level=level)
+        return
+    if encoding not in ENCODINGS:
+        raise ValueError(f"Unknown encoding: {encoding}")
+    if palette is None:
+        raise ValueError(f"{encoding} encoding needs a (background, ink) palette")
+
+    flat = flatten(img, palette[0])
+    if encoding == "png-rgb":
+        flat.save(fp, "PNG", compress_level=level)
+    elif encoding == "png-palette":
+        quantized = palette_indices(flat, *palette)
+        quantized.putpalette(palette_colors(*palette))
+        quantized.save(fp, "PNG", compress_level=level)
+    else:
+        flat.save(fp, "WEBP", lossless=True, quality=100, method=round(level * 6 / 9))
+
+
+def benchmark(images, encodings=ENCODINGS, levels=(1, DEFAULT_LEVEL, 9), palette=None):
+    """
+    Encode every image with every (encoding, level) pair in memory.
+    Returns a list of `(encoding, level, mean_bytes, mean_seconds)`.
+    """
+    results = []
+    for encoding in encodings:
+        for level in levels:
+            total_bytes = 0
+            start = time.perf_counter()
+            for img in images:
+                buffer = io.BytesIO()
+                encode(img, buffer, encoding, level, palette)
+                total_bytes += buffer.tell()
+            elapsed = time.perf_counter() - start
+            results.append((encoding, level, total_bytes / len(images), elapsed / len(images)))
+    return results
+
+
+if __name__ == "__main__":
+    import tempfile
+    import logging
+    from alponagen import ArtGenerator, COLORS
+    from textures import TEXTURE_NAMES
+
+    argparser = argparse.ArgumentParser("AlponaGen encoding benchmark")
+    argparser.add_argument("-n", type=int, default=10, help="Number of seeded images to encode.")
+    argparser.add_argument("-w", "--width", type=int, default=1024, help="Width of the generated images.")
+    argparser.add_argument("-ht", "--height", type=int, default=1024, help="Height of the generated images.")
+    argparser.add_argument("--texture", choices=TEXTURE_NAMES, default=None, help="Background texture.")
+    args = argparser.parse_args()
+
+    logging.getLogger('AlponaGen.ArtGenerator').setLevel('WARNING')
+    gen = ArtGenerator(width=args.width, height=args.height, output_dir=tempfile.gettempdir(), texture=args.texture)
+    images = [gen.render("alpona", seed=seed) for seed in range(args.n)]
+
+    results = benchmark(images, palette=(COLORS["clay"], COLORS["white"]))
+    baseline = next(size for encoding, level, size, _ in results if encoding == "png" and level == DEFAULT_LEVEL)
+    print(f"{'encoding':<12} {'level':>5} {'bytes/image':>12} {'vs png':>7} {'encode ms':>10}")
+    for encoding, level, size, seconds in results:
+        print(f"{encoding:<12} {level:>5} {size:>12,.0f} {size / baseline:>7.2f} {seconds * 1000:>10.1f}")
@@ -0,0 +1,205 @@
+"""
+AlponaGen v1.1
+---------------------
+Golden-render regression corpus.
+
+Renders a fixed set of seeds at several sizes and compares them against a
+recorded corpus, so changes to the renderer or to `layer_styles` can be shown
+to leave the output unchanged (or within a stated per-pixel tolerance).
+
+The corpus directory holds `manifest.json` with a SHA-256 of the raw RGBA
+pixels of every render, plus a reference PNG for every case. Renders larger
+than REFERENCE_MAX_SIZE keep their reference box-downsampled to that size
+(a full-size textured reference is about 1 MB); non-exact renders of those
+cases are downsampled the same way before comparing, so their statistics
+describe block averages, where a change confined to single pixels appears
+at 1/16 of its strength for a 1024 px case. Besides
+the plain renders, every entry of VARIANTS is recorded with its
+`ArtGenerator` options, so the optional passes are held to the same
+"same seed, same pixels" guarantee across processes.
+
+Usage:
+    python golden.py record              # (re)build the corpus
+    python golden.py check               # exact comparison
+    python golden.py check --max-diff 8 --max-fraction 0.001
+
+Author: Aritro Shome
+Date: 2025-10-09
+"""
+
+import os
+import json
+import hashlib
+import logging
+import argparse
+
+import numpy as np
+import PIL
+from PIL import Image
+
+from alponagen import ArtGenerator
+from logconfig import setup_logging
+from utils import ensure_dir
+
+GOLDEN_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "golden")
+MANIFEST_NAME = "manifest.json"
+
+SEEDS = (0, 1, 2, 3)
+SIZES = (64, 128, 256, 1024)
+REFERENCE_MAX_SIZE = 256  # larger references are box-downsampled to this size
+
+# variant name -> ArtGenerator options, rendered for every seed at VARIANT_SIZES
+VARIANTS = {
+    "wobble": {"wobble": 2.0},
+    "paper": {"texture": "paper"},
+    "clay": {"texture": "clay"},
+}
+VARIANT_SIZES = (128, 256, 1024)
+
+
+def pixel_hash(img):
+    """SHA-256 of the raw RGBA pixel data, independent of PNG encoder settings."""
+    img = img.convert("RGBA")
+    digest = hashlib.sha256()
+    digest.update(f"{img.width}x{img.height}:".encode())
+    digest.update(img.tobytes())
+    return digest.hexdigest()
+
+
+def reference_image(img, size=REFERENCE_MAX_SIZE):
+    """`img` itself if it fits in `size`, else its box-downsampled copy of at most `size` pixels."""
+    if max(img.size) <= size:
+        return img
+    scale = size / max(img.size)
+    return img.resize((round(img.width * scale), round(img.height * scale)), Image.BOX)
+
+
+def render_case(seed, size, tolerance=None, options=None):
+    """Render the alpona design for `seed` at `size` x `size` pixels with `ArtGenerator` `options`."""
+    kwargs = dict(options or {})
+    if tolerance is not None:
+        kwargs["tolerance"] = tolerance
+    gen = ArtGenerator(width=size, height=size, output_dir=GOLDEN_DIR, **kwargs)
+    return gen.render("alpona", seed=seed)
+
+
+def _case_name(seed, size, variant=None):
+    return f"seed{seed}_{size}" if variant is None else f"seed{seed}_{size}_{variant}"
+
+
+def _cases(seeds, sizes):
+    """Yield `(name, seed, size, options)` for the plain renders and every variant."""
+    for size in sizes:
+        for seed in seeds:
+            yield _case_name(seed, size), seed, size, {}
+    for variant, options in VARIANTS.items():
+        for size in VARIANT_SIZES:
+            for seed in seeds:
+                yield _case_name(seed, size, variant), seed, size, options
+
+
+def record(golden_dir=GOLDEN_DIR, seeds=SEEDS, sizes=SIZES):
+    """Render every (seed, size) case and write the corpus to `golden_dir`."""
+    ensure_dir(golden_dir)
+    cases = {}
+    for name, seed, size, options in _cases(seeds, sizes):
+        img = render_case(seed, size, options=options)
+        case = {"seed": seed, "size": size, "options": options, "sha256": pixel_hash(img), "reference": f"{name}.png"}
+        reference_image(img).save(os.path.join(golden_dir, case["reference"]), "PNG", optimize=True)
+        cases[name] = case
+
+    manifest = {
+        "versions": {"pillow": PIL.__version__, "numpy": np.__version__},
+        "cases": cases,
+    }
+    with open(os.path.join(golden_dir, MANIFEST_NAME), "w") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    return manifest
+
+
+def diff_stats(expected, actual):
+    """
+    Per-pixel difference statistics between two RGBA images of the same size.
+
+    Returns a dict with the largest channel difference (`max`), the mean
+    absolute channel difference (`mean`) and the fraction of pixels where any
+    channel differs (`fraction`).
+    """
+    a = np.asarray(expected.convert("RGBA"), dtype=np.int16)
+    b = np.asarray(actual.convert("RGBA"), dtype=np.int16)
+    if a.shape != b.shape:
+        raise ValueError(f"size mismatch: {a.shape} vs {b.shape}")
+    delta = np.abs(a - b)
+    return {
+        "max": int(delta.max()),
+        "mean": float(delta.mean()),
+        "fraction": float(np.any(delta > 0, axis=2).mean()),
+    }
+
+
+def check(golden_dir=GOLDEN_DIR, max_diff=0, max_fraction=0.0, tolerance=None):
+    """
+    Re-render every case of the corpus and compare it with the recording.
+
+    A case is `exact` when the pixel hash matches. Otherwise the render is
+    compared with the reference image (downsampled to the reference's size
+    first, for large cases): it passes as `within` when the largest channel
+    difference is at most `max_diff` and the fraction of differing pixels is
+    at most `max_fraction`, and fails as `differs` otherwise. Cases without
+    a reference (corpora recorded before every case had one) that do not
+    match are reported as `mismatch`.
+
+    Returns a list of `(name, status, stats)` tuples.
+    """
+    with open(os.path.join(golden_dir, MANIFEST_NAME)) as f:
+        manifest = json.load(f)
+
+    results = []
+    for name, case in sorted(manifest["cases"].items(), key=lambda item: (item[1]["size"], item[1]["seed"], item[0])):
+        img = render_case(case["seed"], case["size"], tolerance, case.get("options"))
+        if pixel_hash(img) == case["sha256"]:
+            results.append((name, "exact", None))
+            continue
+        if not case["reference"]:
+            results.append((name, "mismatch", None))
+            continue
+        with Image.open(os.path.join(golden_dir, case["reference"])) as reference:
+            stats = diff_stats(reference, reference_image(img, max(reference.size)))
+        passed = stats["max"] <= max_diff and stats["fraction"] <= max_fraction
+        results.append((name, "within" if passed else "differs", stats))
+    return results
+
+
+FAILING = ("differs", "mismatch")
+
+if __name__ == "__main__":
+    logger = setup_logging()
+    logging.getLogger('AlponaGen.ArtGenerator').setLevel('WARNING')
+
+    argparser = argparse.ArgumentParser("AlponaGen golden corpus")
+    argparser.add_argument("command", choices=["record", "check"], help="Record a new corpus or check against the existing one.")
+    argparser.add_argument("--dir", type=str, default=GOLDEN_DIR, help="Corpus directory.")
+    argparser.add_argument("--max-diff", type=int, default=0, help="Largest per-channel difference accepted for non-exact matches.")
+    argparser.add_argument("--max-fraction", type=float, default=0.0, help="Largest fraction of differing pixels accepted for non-exact matches.")
+    argparser.add_argument("--tolerance", type=float, default=None, help="Curve tolerance to render with (defaults to ArtGenerator's).")
+    args = argparser.parse_args()
+
+    if args.command == "record":
+        manifest = record(args.dir)
+        logger.info(f"Recorded {len(manifest['cases'])} cases in {args.dir}")
+        raise SystemExit(0)
+
+    with open(os.path.join(args.dir, MANIFEST_NAME)) as f:
+        versions = json.load(f)["versions"]
+    if versions["pillow"] != PIL.__version__:
+        logger.warning(f"Corpus was recorded with Pillow {versions['pillow']}, running {PIL.__version__}")
+
+    results = check(args.dir, args.max_diff, args.max_fraction, args.tolerance)
+    for name, status, stats in results:
+        detail = "" if stats is None else f" max={stats['max']} mean={stats['mean']:.4f} fraction={stats['fraction']:.5f}"
+        log = logger.error if status in FAILING else logger.info
+        log(f"{name}: {status}{detail}")
+
+    failed = sum(1 for _, status, _ in results if status in FAILING)
+    logger.info(f"{len(results) - failed}/{len(results)} cases passed")
+    raise SystemExit(1 if failed else 0)
@@ -131,7 +131,7 @@ class AlponaGenGUI:
             self.log("Output directory does not exist.")
 
     def load_images(self, output_dir):
-        self.image_list = [os.path.join(output_dir, f) for f in os.listdir(output_dir) if f.endswith(".png")]
+        self.image_list = [os.path.join(output_dir, f) for f in os.listdir(output_dir) if f.endswith((".png", ".webp"))]
         if self.image_list:
             self.current_image_index = 0
             self.show_image()
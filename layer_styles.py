@@ -11,9 +11,10 @@ Date: 2025-10-09
 
 import math
 import random
-import numpy as np
 
-from utils import lerp
+from utils import lerp, linspace, curve_segments, arc_segments
+
+DEFAULT_TOLERANCE = 0.5  # max distance in pixels between a drawn polyline and its true curve
 
 def _get_line_width(is_filled):
     """Determines line width: thicker for outlined, thinner for filled."""
@@ -43,6 +44,8 @@ def draw_triangles_base(draw, environment, inner_r, outer_r, is_filled):
     line_width = _get_line_width(is_filled)
     center = environment["center"]
     white = environment["white"]
+    # More segments = smoother curve; enough to keep the base arc within tolerance
+    num_arc_segments = arc_segments(inner_r, 2 * math.pi / n_triangles, environment.get("tolerance", DEFAULT_TOLERANCE))
     for i in range(n_triangles):
         angle1 = 2 * math.pi * i / n_triangles
         angle2 = 2 * math.pi * (i + 1) / n_triangles
@@ -56,7 +59,6 @@ def draw_triangles_base(draw, environment, inner_r, outer_r, is_filled):
         if is_filled:
             # For a filled shape, we approximate the curved base with many small line segments
             arc_points = []
-            num_arc_segments = 10  # More segments = smoother curve
             
             # Generate points along the arc from p2's angle to p1's angle
             for step in range(num_arc_segments + 1):
@@ -165,11 +167,14 @@ def draw_spiral(draw, environment, inner_r, outer_r):
     - The spiral is defined by polar coordinates:
       (x, y) = (center_x + r * cos(t), center_y + r * sin(t))
       where r interpolates linearly between inner_r and outer_r as t increases.
+    - t is sampled uniformly, so the chord error is largest on the outermost
+      turn; the segment count is chosen so that turn stays within tolerance.
     """
     points = []
     turns = random.randint(4, 7)
     line_width = random.randint(1, 2)
-    for t in np.linspace(0, 2 * math.pi * turns, 300):
+    segments = arc_segments(outer_r, 2 * math.pi * turns, environment.get("tolerance", DEFAULT_TOLERANCE))
+    for t in linspace(0, 2 * math.pi * turns, segments + 1):
         r = lerp(inner_r, outer_r, t / (2 * math.pi * turns))
         points.append((environment["center"][0] + r * math.cos(t), environment["center"][1] + r * math.sin(t)))
     draw.line(points, fill=environment["white"] + (180,), width=line_width)
@@ -248,7 +253,8 @@ def draw_crosshatch(draw, environment, inner_r, outer_r):
     for direction in [-1, 1]:
         points = []
         turns = random.randint(6, 10)
-        for t in np.linspace(0, 2*math.pi*turns, 200):
+        segments = arc_segments(outer_r, 2*math.pi*turns, environment.get("tolerance", DEFAULT_TOLERANCE))
+        for t in linspace(0, 2*math.pi*turns, segments + 1):
             r = lerp(inner_r, outer_r, t/(2*math.pi*turns))
             angle_offset = 0.15 * math.sin(t * 0.7)
             points.append((center[0] + r*math.cos(t*direction + angle_offset), center[1] + r*math.sin(t*direction + angle_offset)))
@@ -330,6 +336,12 @@ def draw_lotus_petals_base(draw, environment, inner_r, outer_r, is_filled):
     - The path follows a sinusoidal curve from a base point on the inner radius
       out to a maximum width at the midpoint radius, and back to the tip at the outer radius.
     - Two symmetrical curves are generated to form one complete petal.
+    - The bulge has tangential height outer_r * petal_width_factor over a radial
+      run of (outer_r - inner_r), so its peak curvature is about
+      height * pi^2 / run^2. The petal is sampled uniformly in t, and at the
+      peak the curve moves about `run` per unit t, so the chords there are
+      run / segments long: the vertex count follows from the run and that
+      curvature, about pi * sqrt(height / (8 * tolerance)).
     """
     n_petals = random.randint(8, 16)
     line_width = _get_line_width(is_filled)
@@ -337,12 +349,17 @@ def draw_lotus_petals_base(draw, environment, inner_r, outer_r, is_filled):
     white = environment["white"]
     petal_width_factor = (math.pi / n_petals) * 0.8  # Max angular width of a petal
 
+    run = outer_r - inner_r
+    bulge = outer_r * petal_width_factor
+    segments = curve_segments(run, bulge * math.pi ** 2 / max(run, 1) ** 2,
+                              environment.get("tolerance", DEFAULT_TOLERANCE))
+
     for i in range(n_petals):
         base_angle = 2 * math.pi * i / n_petals
         
         # Build one half of the petal
         points_half = []
-        for t in np.linspace(0, 1, 15): # 15 segments for a smooth curve
+        for t in linspace(0, 1, segments + 1):
             r = lerp(inner_r, outer_r, t)
             # Use sin(t*pi) to make the petal bulge in the middle
             angle_offset = petal_width_factor * math.sin(t * math.pi)
@@ -373,14 +390,17 @@ def draw_braid(draw, environment, inner_r, outer_r):
     - Their radii oscillate between `inner_r` and `outer_r` based on their angle `theta`.
     - One wave is given a phase offset of `pi` relative to the other,
       causing them to intersect at the midpoint radius.
+    - At a crest (radius outer_r) the curvature is about
+      (amplitude * freq^2 + outer_r) / outer_r^2, which sets the segment count.
     """
-    segments = 150
     freq = random.randint(16, 24)
     line_width = _get_line_width(False)
     center = environment["center"]
     white = environment["white"]
     mid_r = (inner_r + outer_r) / 2
     amplitude = (outer_r - inner_r) / 2
+    segments = curve_segments(2 * math.pi * outer_r, (amplitude * freq ** 2 + outer_r) / max(outer_r, 1) ** 2,
+                              environment.get("tolerance", DEFAULT_TOLERANCE))
 
     for phase in [0, math.pi]: # Two waves, 180 degrees out of phase
         points = []
@@ -430,4 +450,54 @@ def draw_sprouts(draw, environment, inner_r, outer_r):
         # Branch 2
         p_branch2 = (p_mid[0] + branch_length * math.cos(angle - branch_angle),
                      p_mid[1] + branch_length * math.sin(angle - branch_angle))
-        draw.line([p_mid, p_branch2], fill=white+(180,), width=line_width)
\ No newline at end of file
+        draw.line([p_mid, p_branch2], fill=white+(180,), width=line_width)
+
+# ----------------------------------------------------------------------
+# MOTIF LAYER STYLES
+# ----------------------------------------------------------------------
+
+def draw_motif_ring(draw, environment, inner_r, outer_r, kind, tangential=False):
+    """
+    Places a non-radial motif symmetrically around the middle of the ring.
+
+    Mathematical Explanation:
+    - n motifs are centred at (center_x + r_mid * cos(angle), center_y + r_mid * sin(angle))
+      with angle = 2 * pi * i / n.
+    - The motif size is the smaller of the ring width and the spacing between
+      neighbours (2 * pi * r_mid / n), so instances never overlap.
+    - Each motif points outward along `angle` (or along the ring if `tangential`).
+      n divides motifs.ROTATION_BUCKETS, so every instance reuses one of a few
+      pre-rasterized stamps.
+    """
+    n_motifs = random.choice([8, 12, 16, 24, 32])
+    center = environment["center"]
+    white = environment["white"]
+    mid_r = (inner_r + outer_r) / 2
+    size = 0.9 * min(outer_r - inner_r, 2 * math.pi * mid_r / n_motifs)
+    if size < 4:
+        return
+
+    import motifs  # pulls in NumPy and PIL; only needed when motif layers are used
+
+    for i in range(n_motifs):
+        angle = 2 * math.pi * i / n_motifs
+        position = (center[0] + mid_r * math.cos(angle), center[1] + mid_r * math.sin(angle))
+        motifs.place_stamp(draw, kind, position, size, angle + (math.pi / 2 if tangential else 0), white + (200,))
+
+def draw_paisley_ring(draw, environment, inner_r, outer_r):
+    """
+    Draws a ring of paisley (kolka) motifs pointing outward.
+    """
+    draw_motif_ring(draw, environment, inner_r, outer_r, "paisley")
+
+def draw_fish_ring(draw, environment, inner_r, outer_r):
+    """
+    Draws a ring of fish swimming along the ring.
+    """
+    draw_motif_ring(draw, environment, inner_r, outer_r, "fish", tangential=True)
+
+def draw_flower_ring(draw, environment, inner_r, outer_r):
+    """
+    Draws a ring of five-petalled flowers.
+    """
+    draw_motif_ring(draw, environment, inner_r, outer_r, "flower")
@@ -0,0 +1,44 @@
+"""
+AlponaGen v1.1
+---------------------
+One-time logging setup shared by every entry point.
+
+Library modules only create named loggers under "AlponaGen"; the coloured
+console handler is attached once, by whichever script runs, so importing
+modules never adds handlers and colorlog is only loaded when logs are shown.
+
+Author: Aritro Shome
+Date: 2025-10-09
+"""
+
+import logging
+
+ROOT_LOGGER = "AlponaGen"
+
+LOG_FORMAT = '%(log_color)s[%(levelname)s] %(message)s'
+LOG_COLORS = {
+    'DEBUG': 'cyan',
+    'INFO': 'green',
+    'WARNING': 'yellow',
+    'ERROR': 'red',
+    'CRITICAL': 'bold_red',
+}
+
+_configured = False
+
+
+def setup_logging(level="INFO"):
+    """Attach the coloured console handler to the AlponaGen logger (only the first call does)."""
+    global _configured
+    logger = logging.getLogger(ROOT_LOGGER)
+    logger.setLevel(level)
+    if _configured:
+        return logger
+
+    import colorlog
+
+    handler = colorlog.StreamHandler()
+    handler.setFormatter(colorlog.ColoredFormatter(LOG_FORMAT, log_colors=LOG_COLORS))
+    logger.addHandler(handler)
+    _configured = True
+    return logger
@@ -10,24 +10,21 @@ Date: 2025-10-09
 """
 
 from alponagen import ArtGenerator
-import colorlog
+from sharding import ShardSpec, ShardLedger, merge_shards
+from plan_index import PlanIndex
+from logconfig import setup_logging
+import layer_styles
+import encoders
+import textures
 import argparse
 
-# Configure colorlog
-handler = colorlog.StreamHandler()
-handler.setFormatter(colorlog.ColoredFormatter(
-    '%(log_color)s[%(levelname)s] %(message)s',
-    log_colors={
-        'DEBUG': 'cyan',
-        'INFO': 'green',
-        'WARNING': 'yellow',
-        'ERROR': 'red',
-        'CRITICAL': 'bold_red',
-    }
-))
-logger = colorlog.getLogger('AlponaGen')
-logger.addHandler(handler)
-logger.setLevel('INFO')
+
+def positive_float(value):
+    """argparse type for a strictly positive float."""
+    number = float(value)
+    if not number > 0:
+        raise argparse.ArgumentTypeError(f"must be greater than 0, got {value}")
+    return number
 
 if __name__ == "__main__":
     argparser = argparse.ArgumentParser("AlponaGen")
@@ -36,14 +33,72 @@ if __name__ == "__main__":
     argparser.add_argument("-out", "--output", type=str, default="output", help="Output directory for generated images.")
     argparser.add_argument("-v", "--version", action="version", version="AlponaGen v1.1", help="Show program version.")
     argparser.add_argument("-count", "-c", type=int, default=10, help="Number of images to generate. Defaults to 10.")
+    argparser.add_argument("--tolerance", type=positive_float, default=layer_styles.DEFAULT_TOLERANCE, help=f"Max curve approximation error in pixels. Higher is faster, lower is smoother. Defaults to {layer_styles.DEFAULT_TOLERANCE}.")
+    argparser.add_argument("--wobble", type=float, default=0.0, help="Amplitude in pixels of the hand-drawn line wobble. Defaults to 0 (off).")
+    argparser.add_argument("--texture", choices=textures.TEXTURE_NAMES, default=None, help="Background texture. Defaults to a flat background.")
+    argparser.add_argument("--motifs", action="store_true", help="Include paisley, fish and flower motif layers.")
+    argparser.add_argument("--encoding", choices=encoders.ENCODINGS, default="png", help="Image encoding. Defaults to RGBA PNG.")
+    argparser.add_argument("--compress-level", type=int, default=encoders.DEFAULT_LEVEL, choices=range(10), metavar="0-9", help=f"Compression effort, 0 (fastest) to 9 (smallest). Defaults to {encoders.DEFAULT_LEVEL}.")
+    argparser.add_argument("--dedup-index", type=str, default=None, metavar="PATH", help="Plan index file used to skip repeat designs across runs.")
+    argparser.add_argument("--dedup-distance", type=int, default=0, help="Treat designs differing in at most this many layers as duplicates. Defaults to 0 (exact).")
+    argparser.add_argument("--dedup-mode", choices=["resample", "reject"], default="resample", help="Resample a duplicate design or skip the image. Defaults to resample.")
+    argparser.add_argument("--shards", type=int, default=None, help="Split the -count images into this many deterministic seed ranges (one per node).")
+    argparser.add_argument("--shard-index", type=int, default=0, help="Index of the shard this node generates. Defaults to 0.")
+    argparser.add_argument("--seed-base", type=int, default=0, help="First seed of the dataset when sharding. Defaults to 0.")
+    argparser.add_argument("--merge", nargs="+", metavar="SHARD_DIR", default=None, help="Verify the given shard directories and merge them into the output directory.")
+    argparser.add_argument("--allow-incomplete", action="store_true", help="Merge even if shards have gaps or duplicates.")
     args = argparser.parse_args()
+    if args.shards is not None:
+        if args.shards < 1:
+            argparser.error(f"--shards must be at least 1, got {args.shards}")
+        if not 0 <= args.shard_index < args.shards:
+            argparser.error(f"--shard-index must be between 0 and {args.shards - 1}, got {args.shard_index}")
+        if args.count < 0:
+            argparser.error(f"-count must not be negative when sharding, got {args.count}")
+    logger = setup_logging()
+
+    if args.merge:
+        logger.info(f"Merging {len(args.merge)} shards into '{args.output}'...")
+        try:
+            report = merge_shards(args.merge, args.output, allow_incomplete=args.allow_incomplete)
+        except (ValueError, OSError) as e:
+            logger.error(str(e))
+            raise SystemExit(1)
+        logger.info(report.summary())
+        if report.gaps:
+            logger.warning(f"Gaps: {report.gaps[:20]}{' ...' if len(report.gaps) > 20 else ''}")
+        if report.duplicates:
+            logger.warning(f"Duplicate seeds: {sorted(report.duplicates)[:20]}")
+        raise SystemExit(0)
 
     logger.info(f"Width: {args.width}")
     logger.info(f"Height: {args.height}")
     logger.info(f"Output Directory: {args.output}")
 
-    gen = ArtGenerator(width=args.width, height=args.height, output_dir=args.output)
-    for index in range(args.count):
-        logger.info("Generating alpona...")
-        gen.generate("alpona", id=index)
+    try:
+        plan_index = PlanIndex(args.dedup_index, args.dedup_distance) if args.dedup_index else None
+    except (ValueError, OSError) as e:
+        logger.error(str(e))
+        raise SystemExit(1)
+    gen = ArtGenerator(width=args.width, height=args.height, output_dir=args.output, tolerance=args.tolerance, wobble=args.wobble, texture=args.texture, motifs=args.motifs,
+                       encoding=args.encoding, compress_level=args.compress_level,
+                       plan_index=plan_index, on_duplicate=args.dedup_mode)
+    if args.shards is None:
+        for index in range(args.count):
+            logger.info("Generating alpona...")
+            gen.generate("alpona", id=index)
+    else:
+        spec = ShardSpec(args.count, args.shards, args.seed_base)
+        try:
+            ledger = ShardLedger(args.output, spec, args.shard_index)
+            pending = ledger.pending()
+        except (ValueError, OSError) as e:
+            logger.error(str(e))
+            raise SystemExit(1)
+        seeds = spec.shard_range(args.shard_index)
+        logger.info(f"Shard {args.shard_index}/{args.shards}: seeds {seeds.start}..{seeds.stop - 1}, {len(pending)} pending")
+        for seed in pending:
+            logger.info("Generating alpona...")
+            filename = gen.generate("alpona", id=seed, seed=seed)
+            ledger.record(seed, filename)
     logger.info(f"\n[+] Generation complete. Check the '{args.output}' directory.")
\ No newline at end of file
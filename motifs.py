@@ -0,0 +1,117 @@
+"""
+AlponaGen v1.1
+---------------------
+Pre-rasterized motif stamps for non-radial motifs.
+
+Motifs such as the paisley (kolka), fish and flower are drawn dozens of
+times per layer at the same size and only a handful of orientations. Each
+motif is therefore rasterized once per (size, rotation bucket, opacity) into
+an antialiased "L" alpha stamp, kept in a process-wide LRU atlas that is
+shared by every image, and placed with `ImageDraw.bitmap`.
+
+Motif outlines are defined in a unit frame pointing along +x, with every
+point inside the unit circle, so a stamp of `size` pixels always fits.
+
+Author: Aritro Shome
+Date: 2025-10-09
+"""
+
+import math
+from functools import lru_cache
+import numpy as np
+from PIL import Image, ImageDraw
+
+ROTATION_BUCKETS = 96  # divisible by every ring count the motif layers use
+SUPERSAMPLE = 4
+ATLAS_SIZE = 2048      # stamps kept in the process-wide atlas (least recently used are dropped)
+
+
+def _bezier(p0, p1, p2, p3, steps):
+    t = np.linspace(0, 1, steps + 1)[:, None]
+    return ((1 - t) ** 3 * p0 + 3 * (1 - t) ** 2 * t * p1
+            + 3 * (1 - t) * t ** 2 * p2 + t ** 3 * p3)
+
+
+def _circle(cx, cy, r, steps):
+    theta = np.linspace(0, 2 * math.pi, steps, endpoint=False)
+    return np.column_stack((cx + r * np.cos(theta), cy + r * np.sin(theta)))
+
+
+def _paisley(steps):
+    """Kolka: a round bulb at the back tapering into a curled tip at the front."""
+    c, r = np.array([-0.35, 0.0]), 0.6
+    arc = np.radians(np.linspace(70, 290, steps + 1))
+    bulb = c + r * np.column_stack((np.cos(arc), np.sin(arc)))
+    a, b, tip = bulb[0], bulb[-1], np.array([0.94, 0.33])
+    lower = _bezier(b, np.array([0.42, -0.36]), np.array([0.9, -0.05]), tip, steps)
+    upper = _bezier(tip, np.array([0.7, 0.4]), np.array([0.325, 0.393]), a, steps)
+    return [np.concatenate((bulb, lower[1:], upper[1:-1]))], [_circle(-0.35, 0.0, 0.2, steps)]
+
+
+def _fish(steps):
+    """Fish: a lens-shaped body facing +x with a forked tail and an eye."""
+    x = np.linspace(-0.6, 1.0, steps + 1)
+    y = 0.35 * np.sin(math.pi * (x + 0.6) / 1.6)
+    body = np.concatenate((np.column_stack((x, y)), np.column_stack((x[::-1], -y[::-1]))[1:-1]))
+    tail = np.array([[-0.55, 0.0], [-0.95, 0.3], [-0.82, 0.0], [-0.95, -0.3]])
+    return [body, tail], [_circle(0.6, -0.08, 0.07, steps)]
+
+
+def _flower(steps):
+    """Flower: five rounded petals around an open centre."""
+    theta = np.linspace(0, 2 * math.pi, 5 * steps, endpoint=False)
+    r = 0.35 + 0.65 * np.abs(np.cos(2.5 * theta)) ** 0.7
+    return [np.column_stack((r * np.cos(theta), r * np.sin(theta)))], [_circle(0.0, 0.0, 0.15, steps)]
+
+
+MOTIFS = {
+    "paisley": _paisley,
+    "fish": _fish,
+    "flower": _flower,
+}
+
+
+def rotation_bucket(angle):
+    """Index of the rotation bucket closest to `angle` (radians)."""
+    return round(angle / (2 * math.pi) * ROTATION_BUCKETS) % ROTATION_BUCKETS
+
+
+@lru_cache(maxsize=ATLAS_SIZE)
+def rasterize(kind, size, bucket, opacity=255):
+    """
+    Render motif `kind` into a `size` x `size` "L" alpha stamp, rotated to
+    `bucket` and scaled to `opacity`. The motif is drawn at SUPERSAMPLE times
+    the size and box-filtered down for antialiasing.
+    """
+    shapes, holes = MOTIFS[kind](max(16, size // 4))
+    angle = 2 * math.pi * bucket / ROTATION_BUCKETS
+    rotation = np.array([[math.cos(angle), math.sin(angle)], [-math.sin(angle), math.cos(angle)]])
+    half = size * SUPERSAMPLE / 2
+
+    def place(points):
+        return ((points @ rotation) * half + half).ravel().tolist()
+
+    mask = Image.new("L", (size * SUPERSAMPLE, size * SUPERSAMPLE), 0)
+    draw = ImageDraw.Draw(mask)
+    for points in shapes:
+        draw.polygon(place(points), fill=opacity)
+    for points in holes:
+        draw.polygon(place(points), fill=0)
+    return mask.resize((size, size), Image.BOX)
+
+
+def stamp(kind, size, angle, opacity=255):
+    """Return the cached stamp of motif `kind` at `size` pixels pointing along `angle`."""
+    return rasterize(kind, int(round(size)), rotation_bucket(angle), opacity)
+
+
+def place_stamp(draw, kind, position, size, angle, color):
+    """
+    Alpha-paste motif `kind` centred on `position`. `color` is an RGBA tuple;
+    its alpha becomes the stamp opacity and the ink itself stays opaque,
+    because `bitmap` blends every channel (alpha included) by the mask.
+    """
+    mask = stamp(kind, size, angle, color[3])
+    x = int(round(position[0] - mask.width / 2))
+    y = int(round(position[1] - mask.height / 2))
+    draw.bitmap((x, y), mask, fill=color[:3] + (255,))
@@ -0,0 +1,125 @@
+"""
+AlponaGen v1.1
+---------------------
+Plan-level duplicate detection.
+
+An alpona design is fixed by its layer plan (the sequence of layer styles
+picked by `ArtGenerator.plan_alpona`) long before any pixel is drawn. The
+`PlanIndex` stores the plan of every generated image in an append-only file,
+so repeat designs can be rejected or resampled at plan time, across runs.
+
+Two plans are near duplicates when they have the same number of layers and
+differ in at most `max_distance` of them (Hamming distance). Lookups use the
+pigeonhole principle: the plan is cut into `max_distance + 1` bands, and any
+plan within the distance must match at least one band exactly, so only plans
+sharing a band are compared.
+
+Author: Aritro Shome
+Date: 2025-10-09
+"""
+
+import os
+import json
+import hashlib
+
+from utils import ensure_dir
+
+
+def plan_names(plan):
+    """Canonical form of a plan: the tuple of its layer style names."""
+    return tuple(style if isinstance(style, str) else style.__name__ for style in plan)
+
+
+def fingerprint(plan):
+    """Stable hex fingerprint of a plan, identical across processes and runs."""
+    return hashlib.sha1("|".join(plan_names(plan)).encode()).hexdigest()
+
+
+def _bands(names, n_bands):
+    """Split `names` into `n_bands` contiguous slices, keyed by position and content."""
+    size = len(names)
+    keys = []
+    for b in range(n_bands):
+        start, stop = b * size // n_bands, (b + 1) * size // n_bands
+        keys.append((size, b, names[start:stop]))
+    return keys
+
+
+class PlanIndex:
+    """
+    Persistent index of generated plans.
+
+    Each line of the index file is `{"id": ..., "plan": [style names]}`. New
+    lines written by other processes sharing the file are picked up before
+    every lookup, so concurrent workers can share one index (which image of a
+    duplicate pair wins then depends on timing).
+    """
+
+    def __init__(self, path, max_distance=0):
+        self.path = path
+        self.max_distance = max_distance
+        self._exact = {}
+        self._bands = {}
+        self._offset = 0
+        if os.path.dirname(path):
+            ensure_dir(os.path.dirname(path))
+        self._refresh()
+
+    def __len__(self):
+        return len(self._exact)
+
+    def _insert(self, names, id):
+        key = fingerprint(names)
+        if key in self._exact:
+            return
+        self._exact[key] = (names, id)
+        for band in _bands(names, self.max_distance + 1):
+            self._bands.setdefault(band, []).append(key)
+
+    def _refresh(self):
+        """Read entries appended to the index file since the last refresh."""
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, "rb") as f:
+            f.seek(self._offset)
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break  # partially written by another process; read it next time
+                self._offset += len(line)
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    # A writer killed mid-append leaves a truncated line, which the
+                    # next entry is appended to; skip it, as read_ledger does.
+                    continue
+                self._insert(tuple(entry["plan"]), entry["id"])
+
+    def find(self, plan, exclude_id=None):
+        """
+        Return the id of an indexed plan that duplicates `plan` (exactly, or
+        within `max_distance` layers), or None. Entries recorded under
+        `exclude_id` are ignored, so an id regenerated after an interrupted
+        run does not match itself.
+        """
+        self._refresh()
+        names = plan_names(plan)
+        match = self._exact.get(fingerprint(names))
+        if match is not None and match[1] != exclude_id:
+            return match[1]
+        if self.max_distance == 0:
+            return None
+        for band in _bands(names, self.max_distance + 1):
+            for key in self._bands.get(band, ()):
+                other, id = self._exact[key]
+                if id != exclude_id and sum(a != b for a, b in zip(names, other)) <= self.max_distance:
+                    return id
+        return None
+
+    def add(self, plan, id):
+        """Record `plan` as generated under `id`."""
+        names = plan_names(plan)
+        with open(self.path, "a") as f:
+            f.write(json.dumps({"id": id, "plan": list(names)}) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        self._refresh()
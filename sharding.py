@@ -0,0 +1,252 @@
+"""
+AlponaGen v1.1
+---------------------
+Deterministic seed-range sharding for multi-node dataset generation.
+
+A dataset of `total` images is identified by the seeds
+`seed_base .. seed_base + total - 1`. A `ShardSpec` splits that range into
+contiguous, disjoint blocks, one per node. Each node records every finished
+image in a local ledger, and `merge_shards` checks the ledgers against the
+spec before combining the outputs into one dataset.
+
+Author: Aritro Shome
+Date: 2025-10-09
+"""
+
+import os
+import json
+import shutil
+
+from utils import ensure_dir
+
+LEDGER_NAME = "ledger.jsonl"
+
+
+class ShardSpec:
+    """
+    Partition of the seed range `[seed_base, seed_base + total)` into
+    `n_shards` contiguous blocks.
+
+    The first `total % n_shards` shards get one extra seed, so every seed
+    belongs to exactly one shard and the layout depends only on the three
+    numbers of the spec.
+    """
+
+    def __init__(self, total, n_shards=1, seed_base=0):
+        if total < 0:
+            raise ValueError("total must be non-negative")
+        if n_shards < 1:
+            raise ValueError("n_shards must be at least 1")
+        self.total = total
+        self.n_shards = n_shards
+        self.seed_base = seed_base
+
+    def shard_range(self, index):
+        """Return the `range` of seeds assigned to shard `index`."""
+        if not 0 <= index < self.n_shards:
+            raise ValueError(f"shard index {index} out of range for {self.n_shards} shards")
+        size, extra = divmod(self.total, self.n_shards)
+        start = index * size + min(index, extra)
+        stop = start + size + (1 if index < extra else 0)
+        return range(self.seed_base + start, self.seed_base + stop)
+
+    def seeds(self):
+        """Return the full `range` of seeds covered by the spec."""
+        return range(self.seed_base, self.seed_base + self.total)
+
+    def to_dict(self):
+        return {"total": self.total, "n_shards": self.n_shards, "seed_base": self.seed_base}
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data["total"], data["n_shards"], data["seed_base"])
+
+    def __eq__(self, other):
+        return isinstance(other, ShardSpec) and self.to_dict() == other.to_dict()
+
+    def __repr__(self):
+        return f"ShardSpec(total={self.total}, n_shards={self.n_shards}, seed_base={self.seed_base})"
+
+
+# ----------------------------------------------------------------------
+# Completion Ledger
+# ----------------------------------------------------------------------
+
+class ShardLedger:
+    """
+    Append-only record of the seeds a node has finished.
+
+    Each line of `ledger.jsonl` is a JSON object. The first line is a header
+    holding the spec and shard index, every following line holds one
+    completed seed and the file it was written to (relative to the shard's
+    output directory). Entries are flushed after every image, so a node that
+    is interrupted can be restarted and will skip the seeds already done.
+    """
+
+    def __init__(self, output_dir, spec, shard_index):
+        self.output_dir = output_dir
+        self.spec = spec
+        self.shard_index = shard_index
+        self.path = os.path.join(output_dir, LEDGER_NAME)
+        ensure_dir(output_dir)
+
+        if os.path.exists(self.path):
+            header, _ = read_ledger(self.path)
+            if ShardSpec.from_dict(header["spec"]) != spec or header["shard"] != shard_index:
+                raise ValueError(
+                    f"{self.path} was written for shard {header['shard']} of {header['spec']}, "
+                    f"not shard {shard_index} of {spec.to_dict()}"
+                )
+        else:
+            with open(self.path, "w") as f:
+                f.write(json.dumps({"spec": spec.to_dict(), "shard": shard_index}) + "\n")
+
+    def completed(self):
+        """Return the set of seeds already recorded in the ledger."""
+        _, entries = read_ledger(self.path)
+        return {entry["seed"] for entry in entries}
+
+    def pending(self):
+        """Return the seeds of this shard that have not been recorded yet."""
+        done = self.completed()
+        return [seed for seed in self.spec.shard_range(self.shard_index) if seed not in done]
+
+    def record(self, seed, filename):
+        """
+        Append one completed seed to the ledger. `filename` is None for a
+        seed whose design was deliberately skipped (e.g. as a duplicate).
+        """
+        entry = {"seed": seed, "file": None if filename is None else os.path.relpath(filename, self.output_dir)}
+        with open(self.path, "a") as f:
+            f.write(json.dumps(entry) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+
+def read_ledger(path):
+    """Return `(header, entries)` for the ledger at `path`. Raises `ValueError` if the header is unreadable."""
+    entries = []
+    with open(path) as f:
+        try:
+            header = json.loads(f.readline())
+        except json.JSONDecodeError:
+            raise ValueError(f"{path} does not start with a shard ledger header")
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                entries.append(json.loads(line))
+            except json.JSONDecodeError:
+                # A node killed mid-write leaves at most one truncated line;
+                # the seed is simply treated as not completed.
+                continue
+    return header, entries
+
+
+# ----------------------------------------------------------------------
+# Merge
+# ----------------------------------------------------------------------
+
+class MergeReport:
+    """Outcome of checking a set of shard ledgers against their spec."""
+
+    def __init__(self, spec):
+        self.spec = spec
+        self.files = {}          # seed -> absolute source path
+        self.skipped = set()     # seeds completed without an image (rejected duplicates)
+        self.duplicates = {}     # seed -> list of source paths beyond the first
+        self.missing_files = []  # seeds recorded in a ledger whose file is gone
+        self.out_of_range = []   # seeds recorded that the spec does not cover
+        self.gaps = []           # seeds of the spec that no ledger recorded
+
+    @property
+    def ok(self):
+        return not (self.duplicates or self.missing_files or self.out_of_range or self.gaps)
+
+    def summary(self):
+        return (
+            f"{len(self.files) + len(self.skipped)}/{self.spec.total} seeds covered "
+            f"({len(self.skipped)} skipped), "
+            f"{len(self.gaps)} gaps, {len(self.duplicates)} duplicates, "
+            f"{len(self.missing_files)} missing files, {len(self.out_of_range)} out of range"
+        )
+
+
+def verify_shards(shard_dirs):
+    """
+    Read the ledger of every directory in `shard_dirs` and check that
+    together they cover the spec exactly once.
+
+    Returns a `MergeReport`. Raises `ValueError` if a directory has no
+    ledger or the ledgers were written for different specs.
+    """
+    spec = None
+    ledgers = []
+    for shard_dir in shard_dirs:
+        path = os.path.join(shard_dir, LEDGER_NAME)
+        if not os.path.exists(path):
+            raise ValueError(f"{shard_dir} has no {LEDGER_NAME}; it is not a shard output directory")
+        header, entries = read_ledger(path)
+        shard_spec = ShardSpec.from_dict(header["spec"])
+        if spec is None:
+            spec = shard_spec
+        elif shard_spec != spec:
+            raise ValueError(f"{shard_dir} was generated with {shard_spec}, expected {spec}")
+        ledgers.append((shard_dir, entries))
+
+    if spec is None:
+        raise ValueError("no shard directories given")
+
+    report = MergeReport(spec)
+    seeds = spec.seeds()
+    for shard_dir, entries in ledgers:
+        for entry in entries:
+            seed = entry["seed"]
+            if seed not in seeds:
+                report.out_of_range.append(seed)
+                continue
+            if entry["file"] is None:
+                report.skipped.add(seed)
+                continue
+            path = os.path.abspath(os.path.join(shard_dir, entry["file"]))
+            if not os.path.exists(path):
+                report.missing_files.append(seed)
+            elif seed in report.files:
+                if path != report.files[seed]:
+                    report.duplicates.setdefault(seed, []).append(path)
+            else:
+                report.files[seed] = path
+
+    report.skipped -= set(report.files)
+    report.gaps = [seed for seed in seeds
+                   if seed not in report.files and seed not in report.skipped and seed not in report.missing_files]
+    return report
+
+
+def merge_shards(shard_dirs, output_dir, allow_incomplete=False):
+    """
+    Verify the shards in `shard_dirs` and copy their images into `output_dir`,
+    writing a merged ledger that covers the whole spec.
+
+    Refuses to merge (raising `ValueError`) when the report has gaps,
+    duplicates or missing files, unless `allow_incomplete` is set, in which
+    case only the first copy of every covered seed is merged.
+    Returns the `MergeReport`.
+    """
+    report = verify_shards(shard_dirs)
+    if not report.ok and not allow_incomplete:
+        raise ValueError(f"Shards are not mergeable: {report.summary()}")
+
+    ensure_dir(output_dir)
+    with open(os.path.join(output_dir, LEDGER_NAME), "w") as ledger:
+        ledger.write(json.dumps({"spec": report.spec.to_dict(), "shard": None}) + "\n")
+        for seed in sorted(report.files):
+            source = report.files[seed]
+            target = os.path.join(output_dir, os.path.basename(source))
+            if os.path.abspath(target) != source:
+                shutil.copy2(source, target)
+            ledger.write(json.dumps({"seed": seed, "file": os.path.basename(target)}) + "\n")
+        for seed in sorted(report.skipped):
+            ledger.write(json.dumps({"seed": seed, "file": None}) + "\n")
+    return report
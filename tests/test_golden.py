@@ -0,0 +1,17 @@
+"""
+AlponaGen v1.1
+---------------------
+The golden corpus guards every seeded render against regressions.
+
+Author: Aritro Shome
+Date: 2025-10-09
+"""
+
+import golden
+
+
+def test_renders_match_the_golden_corpus():
+    results = golden.check()
+    failed = [(name, status, stats) for name, status, stats in results if status in golden.FAILING]
+    assert len(results) == len(golden.SEEDS) * (len(golden.SIZES) + len(golden.VARIANTS) * len(golden.VARIANT_SIZES))
+    assert not failed, failed
@@ -0,0 +1,58 @@
+"""
+AlponaGen v1.1
+---------------------
+Curve tessellation stays within the requested pixel tolerance.
+
+Author: Aritro Shome
+Date: 2025-10-09
+"""
+
+import math
+import random
+
+import numpy as np
+import pytest
+
+import layer_styles
+
+
+class RecordingDraw:
+    """Collects the point lists passed to `polygon`."""
+
+    def __init__(self):
+        self.polygons = []
+
+    def polygon(self, xy, **kwargs):
+        self.polygons.append(np.asarray(xy, dtype=np.float64))
+
+
+def max_deviation(curve, polyline):
+    """Largest distance from a densely sampled `curve` to the segments of `polyline`."""
+    a, b = polyline[:-1], polyline[1:]
+    ab = b - a
+    t = ((curve[:, None, :] - a) * ab).sum(axis=2) / np.maximum((ab * ab).sum(axis=1), 1e-12)
+    nearest = a + np.clip(t, 0, 1)[..., None] * ab
+    return np.sqrt(((curve[:, None, :] - nearest) ** 2).sum(axis=2)).min(axis=1).max()
+
+
+@pytest.mark.parametrize("size", [256, 1024, 4096])
+@pytest.mark.parametrize("tolerance", [0.25, 0.5, 2.0])
+def test_lotus_petals_stay_within_tolerance(size, tolerance):
+    outer_r = size / 2.2
+    inner_r = outer_r * 24 / 25  # outermost of 25 layers: the largest bulge
+    environment = {"center": (size / 2, size / 2), "white": (255, 255, 255), "tolerance": tolerance}
+    random.seed(size)
+    draw = RecordingDraw()
+    layer_styles.draw_lotus_petals_filled(draw, environment, inner_r, outer_r)
+
+    width = (math.pi / len(draw.polygons)) * 0.8
+    t = np.linspace(0, 1, 4001)
+    r = inner_r + (outer_r - inner_r) * t
+    angle = width * np.sin(t * math.pi)
+    curve = np.column_stack((size / 2 + r * np.cos(angle), size / 2 + r * np.sin(angle)))
+
+    points = draw.polygons[0]
+    half = points[:(len(points) + 1) // 2]
+    assert max_deviation(curve, half) <= tolerance
+    # and no denser than twice the estimate from the peak curvature
+    assert len(half) - 1 <= 2 * math.ceil(math.pi * math.sqrt(outer_r * width / (8 * tolerance)))
@@ -0,0 +1,63 @@
+"""
+AlponaGen v1.1
+---------------------
+Plan-level duplicate detection across interrupted runs.
+
+Author: Aritro Shome
+Date: 2025-10-09
+"""
+
+import random
+
+import pytest
+
+import encoders
+from alponagen import ArtGenerator
+from plan_index import PlanIndex
+
+
+def make_generator(tmp_path, on_duplicate="reject"):
+    index = PlanIndex(str(tmp_path / "index.jsonl"))
+    return ArtGenerator(64, 64, str(tmp_path / "out"), plan_index=index, on_duplicate=on_duplicate), index
+
+
+def test_resumed_seed_does_not_match_itself(tmp_path):
+    gen, index = make_generator(tmp_path)
+    random.seed(3)
+    index.add(gen.plan_alpona(), 3)  # indexed, then the node died before saving
+
+    assert gen.generate("alpona", id=3, seed=3) is not None
+    assert gen.generate("alpona", id=4, seed=3) is None
+
+
+def test_plan_is_indexed_only_after_the_image_is_saved(tmp_path, monkeypatch):
+    gen, index = make_generator(tmp_path)
+
+    def fail(*args, **kwargs):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(encoders, "encode", fail)
+    with pytest.raises(OSError):
+        gen.generate("alpona", id=0, seed=0)
+    assert len(index) == 0
+
+    monkeypatch.undo()
+    assert gen.generate("alpona", id=0, seed=0) is not None
+    assert len(index) == 1
+
+
+def test_truncated_index_line_is_skipped(tmp_path):
+    path = tmp_path / "index.jsonl"
+    path.write_text('{"id": 0, "plan": ["draw_spiral"]}\n{"id": 1, "pla')  # writer killed mid-append
+    index = PlanIndex(str(path))
+    index.add(["draw_braid"], 2)  # lands on the truncated line
+
+    index.add(["draw_sprouts"], 3)
+    assert len(PlanIndex(str(path))) == 2
+    assert PlanIndex(str(path)).find(["draw_sprouts"]) == 3
+
+
+@pytest.mark.parametrize("max_attempts", [0, -1])
+def test_max_attempts_must_be_positive(tmp_path, max_attempts):
+    with pytest.raises(ValueError):
+        ArtGenerator(64, 64, str(tmp_path), max_attempts=max_attempts)
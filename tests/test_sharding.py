@@ -0,0 +1,76 @@
+"""
+AlponaGen v1.1
+---------------------
+Multi-node sharding, exercised the way it is deployed: one `main.py`
+process per shard, then a merge.
+
+Author: Aritro Shome
+Date: 2025-10-09
+"""
+
+import os
+import sys
+import json
+import subprocess
+
+HERE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TOTAL, SHARDS = 7, 3
+
+
+def run_main(*args):
+    return subprocess.run([sys.executable, "main.py", *map(str, args)], cwd=HERE, capture_output=True, text=True)
+
+
+def run_shard(tmp_path, index):
+    out = tmp_path / f"shard{index}"
+    result = run_main("-c", TOTAL, "--shards", SHARDS, "--shard-index", index, "-w", 64, "-ht", 64, "-out", out)
+    assert result.returncode == 0, result.stderr
+    return out
+
+
+def ledger_seeds(directory):
+    with open(directory / "ledger.jsonl") as f:
+        return sorted(json.loads(line)["seed"] for line in f.readlines()[1:])
+
+
+def test_shards_cover_the_dataset_and_merge(tmp_path):
+    shard_dirs = [run_shard(tmp_path, index) for index in range(SHARDS)]
+    assert sorted(sum((ledger_seeds(d) for d in shard_dirs), [])) == list(range(TOTAL))
+
+    # A restarted node finds nothing left to do.
+    assert "0 pending" in run_main("-c", TOTAL, "--shards", SHARDS, "--shard-index", 0, "-out", shard_dirs[0]).stderr
+
+    merged = tmp_path / "merged"
+    result = run_main("--merge", *shard_dirs, "-out", merged)
+    assert result.returncode == 0, result.stderr
+    assert ledger_seeds(merged) == list(range(TOTAL))
+    assert len([name for name in os.listdir(merged) if name.endswith(".png")]) == TOTAL
+
+
+def test_same_seed_gives_same_image_on_every_node(tmp_path):
+    first, second = run_shard(tmp_path, 1), run_shard(tmp_path / "again", 1)
+    for name in os.listdir(first):
+        if name.endswith(".png"):
+            assert (first / name).read_bytes() == (second / name).read_bytes()
+
+
+def test_merge_refuses_gaps(tmp_path):
+    shard_dirs = [run_shard(tmp_path, index) for index in range(SHARDS)]
+    result = run_main("--merge", *shard_dirs[:2], "-out", tmp_path / "merged")
+    assert result.returncode == 1
+    assert "not mergeable" in result.stderr and "Traceback" not in result.stderr
+
+    result = run_main("--merge", *shard_dirs[:2], "--allow-incomplete", "-out", tmp_path / "partial")
+    assert result.returncode == 0, result.stderr
+
+
+def test_bad_shard_input_is_reported_without_traceback(tmp_path):
+    result = run_main("--merge", tmp_path, "-out", tmp_path / "merged")
+    assert result.returncode == 1 and "no ledger.jsonl" in result.stderr
+
+    result = run_main("-c", TOTAL, "--shards", SHARDS, "--shard-index", SHARDS, "-out", tmp_path / "x")
+    assert result.returncode == 2 and "--shard-index" in result.stderr
+
+    shard = run_shard(tmp_path, 0)
+    result = run_main("-c", TOTAL + 1, "--shards", SHARDS, "--shard-index", 0, "-out", shard)
+    assert result.returncode == 1 and "was written for shard" in result.stderr
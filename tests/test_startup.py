@@ -0,0 +1,27 @@
+"""
+AlponaGen v1.1
+---------------------
+Cold-start budget, enforced through bench_startup.
+
+The budgets are multiplied by BUDGET_SCALE so that shared CI machines do
+not fail on noise; a regression such as an eager NumPy or Pillow import
+still exceeds them.
+
+Author: Aritro Shome
+Date: 2025-10-09
+"""
+
+import bench_startup
+
+BUDGET_SCALE = 3.0
+
+
+def test_import_main_does_not_load_heavy_modules():
+    assert bench_startup.eagerly_imported() == []
+
+
+def test_cold_start_within_budget():
+    over = [f"{name} took {median * 1000:.1f} ms (budget {limit * 1000:.0f} ms)"
+            for name, median, limit in bench_startup.time_cases(runs=3, scale=BUDGET_SCALE)
+            if limit is not None and median > limit]
+    assert not over, "; ".join(over)
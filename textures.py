@@ -0,0 +1,154 @@
+"""
+AlponaGen v1.1
+---------------------
+Cached, memory-mapped background textures.
+
+Procedural paper and clay grain is expensive to synthesize at full image
+resolution, so each texture is built once per (kind, resolution) as a
+tileable tile and stored on disk as a `.npy` file. Every process maps the
+file read-only, so workers of a batch share the same pages, and the
+background is produced by cropping the tile to the canvas.
+
+The tile is the next power of two at least as large as the canvas (capped at
+MAX_TILE_SIZE), so the broad low-frequency blotches do not visibly repeat
+across an image. Cache filenames carry a hash of the tile parameters and
+TILE_VERSION, so changing TEXTURE_KINDS never reuses a stale tile.
+
+A tile is a single uint8 grain map with 128 as the neutral level. The canvas
+is filled with a darkened background colour and a lightened colour is blended
+over it through the grain map with one `ImageDraw.bitmap` call, so the grain
+averages out to the original colour.
+
+Author: Aritro Shome
+Date: 2025-10-09
+"""
+
+import os
+import json
+import hashlib
+from utils import ensure_dir, peek_rng
+
+CACHE_DIR = os.environ.get(
+    "ALPONAGEN_CACHE", os.path.join(os.path.expanduser("~"), ".cache", "alponagen")
+)
+MIN_TILE_SIZE = 128
+MAX_TILE_SIZE = 2048
+TILE_VERSION = 1  # bump when build_tile changes in a way TEXTURE_KINDS does not show
+
+# kind -> list of (spectral falloff exponent, weight) noise octaves
+TEXTURE_KINDS = {
+    "paper": [(0.6, 0.7), (2.0, 0.3)],   # fine fibrous grain over faint blotches
+    "clay": [(2.2, 0.75), (0.4, 0.25)],  # broad blotches with a little grit
+}
+TEXTURE_NAMES = tuple(TEXTURE_KINDS)
+
+# NumPy and PIL are imported inside the functions that use them, so the CLI
+# can read TEXTURE_NAMES without paying for them at startup.
+
+_loaded = {}
+
+
+def _periodic_noise(size, exponent, rng):
+    """
+    Tileable noise of shape (size, size) with a 1/f^exponent spectrum,
+    normalized to [-1, 1]. Filtering white noise in the Fourier domain makes
+    the result wrap seamlessly at the tile edges.
+    """
+    import numpy as np
+
+    white = rng.standard_normal((size, size))
+    fy = np.fft.fftfreq(size)[:, None]
+    fx = np.fft.rfftfreq(size)[None, :]
+    freq = np.sqrt(fx * fx + fy * fy)
+    freq[0, 0] = 1.0
+    spectrum = np.fft.rfft2(white) / freq ** exponent
+    spectrum[0, 0] = 0.0
+    noise = np.fft.irfft2(spectrum, s=(size, size))
+    return noise / np.abs(noise).max()
+
+
+def tile_size_for(width, height):
+    """Tile size for a (width, height) canvas: the next power of two covering it, within limits."""
+    size = 1 << (max(width, height, 1) - 1).bit_length()
+    return max(MIN_TILE_SIZE, min(MAX_TILE_SIZE, size))
+
+
+def build_tile(kind, size, seed=0):
+    """Synthesize the (size, size) uint8 grain tile for `kind`."""
+    if kind not in TEXTURE_KINDS:
+        raise ValueError(f"Unknown texture kind: {kind}")
+    import numpy as np
+
+    rng = np.random.default_rng(seed)
+    grain = sum(weight * _periodic_noise(size, exponent, rng) for exponent, weight in TEXTURE_KINDS[kind])
+    grain /= np.abs(grain).max()
+    return np.round((grain + 1) * 127.5).astype(np.uint8)
+
+
+def tile_path(kind, size, seed=0, cache_dir=CACHE_DIR):
+    """Cache path of a tile, keyed by everything `build_tile` depends on."""
+    params = json.dumps({"version": TILE_VERSION, "octaves": TEXTURE_KINDS[kind], "seed": seed})
+    digest = hashlib.sha1(params.encode()).hexdigest()[:12]
+    return os.path.join(cache_dir, "textures", f"{kind}_{size}_{digest}.npy")
+
+
+def load_tile(kind, size, seed=0, cache_dir=CACHE_DIR):
+    """
+    Return the tile for (kind, size, seed) as a read-only memory-mapped array,
+    building and persisting it first if it is not cached yet.
+
+    The file is written under a temporary name and renamed into place, so
+    concurrent workers never map a partially written tile.
+    """
+    if kind not in TEXTURE_KINDS:
+        raise ValueError(f"Unknown texture kind: {kind}")
+    path = tile_path(kind, size, seed, cache_dir)
+    if path in _loaded:
+        return _loaded[path]
+    import numpy as np
+
+    if not os.path.exists(path):
+        ensure_dir(os.path.dirname(path))
+        tmp = f"{path}.{os.getpid()}.tmp"
+        out = np.lib.format.open_memmap(tmp, mode="w+", dtype=np.uint8, shape=(size, size))
+        out[:] = build_tile(kind, size, seed)
+        out.flush()
+        del out
+        os.replace(tmp, path)
+
+    _loaded[path] = np.load(path, mmap_mode="r")
+    return _loaded[path]
+
+
+def texture_mask(kind, width, height, tile_size=None, offset=(0, 0), cache_dir=CACHE_DIR):
+    """
+    Tile the cached texture over a (width, height) canvas starting at `offset`
+    within the tile, and return the grain as an "L" image. `tile_size`
+    defaults to `tile_size_for(width, height)`.
+    """
+    import numpy as np
+    from PIL import Image
+
+    tile_size = tile_size or tile_size_for(width, height)
+    tile = load_tile(kind, tile_size, cache_dir=cache_dir)
+    ox, oy = offset[0] % tile_size, offset[1] % tile_size
+    reps_y = (oy + height + tile_size - 1) // tile_size
+    reps_x = (ox + width + tile_size - 1) // tile_size
+    return Image.fromarray(np.tile(tile, (reps_y, reps_x))[oy:oy + height, ox:ox + width])
+
+
+def draw_texture(draw, width, height, kind, color, strength=0.15, tile_size=None):
+    """
+    Fill the (width, height) canvas with `color` textured by `kind`.
+    `strength` is how far, as a fraction, the grain darkens or lightens
+    the colour. The tile offset is picked without advancing the random
+    state, so enabling textures does not change the rest of a seeded design.
+    """
+    tile_size = tile_size or tile_size_for(width, height)
+    rng = peek_rng()
+    offset = (rng.randrange(tile_size), rng.randrange(tile_size))
+    dark = tuple(int(c * (1 - strength)) for c in color)
+    light = tuple(min(255, int(c * (1 + strength))) for c in color)
+    draw.rectangle([0, 0, width, height], fill=dark)
+    # bitmap() blends every channel by the mask, so an opaque ink keeps the canvas opaque.
+    draw.bitmap((0, 0), texture_mask(kind, width, height, tile_size, offset), fill=light + (255,))
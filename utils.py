@@ -8,8 +8,9 @@ Date: 2025-10-09
 """
 
 import os
+import math
 import random
-import numpy as np
+import hashlib
 
 def ensure_dir(path: str):
     """Ensure the output directory exists."""
@@ -22,10 +23,54 @@ def ensure_dir(path: str):
 #         return random.choice(palette)
 #     return tuple(np.random.randint(0, 256, 3))
 
+def peek_rng():
+    """
+    Return a `random.Random` seeded from the current global random state
+    without advancing it, so optional effects can draw random numbers
+    without changing the rest of a seeded design.
+
+    The seed is a SHA-256 of the Mersenne Twister state words, so it is the
+    same in every process (the builtin `hash` of the state tuple is not).
+    """
+    words = random.getstate()[1]
+    digest = hashlib.sha256(",".join(map(str, words)).encode()).digest()
+    return random.Random(int.from_bytes(digest[:8], "big"))
+
 def lerp(a, b, t):
     """Linear interpolation between a and b by factor t."""
     return a + (b - a) * t
 
+def linspace(start, stop, num):
+    """
+    `num` evenly spaced values from `start` to `stop` inclusive, computed the
+    same way as `numpy.linspace` (so results are bit-identical) without
+    importing NumPy.
+    """
+    if num == 1:
+        return [float(start)]
+    step = (stop - start) / (num - 1)
+    return [start + i * step for i in range(num - 1)] + [float(stop)]
+
 def get_line_width(is_filled):
     """Returns a line width to draw the shapes of the current layer."""
-    return random.randint(1, 2) if is_filled else random.randint(2, 4)
\ No newline at end of file
+    return random.randint(1, 2) if is_filled else random.randint(2, 4)
+
+def curve_segments(length, curvature, tolerance, min_segments=2):
+    """
+    Number of equal chords needed so a polyline stays within `tolerance` pixels
+    of a curve with the given arc `length` and maximum `curvature` (1 / radius).
+
+    A chord of length L on a curve of curvature k deviates from it by the
+    sagitta, approximately k * L^2 / 8, so the longest allowed chord is
+    sqrt(8 * tolerance / k).
+    """
+    if length <= 0 or curvature <= 0:
+        return min_segments
+    max_chord = math.sqrt(8 * tolerance / curvature)
+    return max(min_segments, math.ceil(length / max_chord))
+
+def arc_segments(radius, sweep, tolerance, min_segments=2):
+    """Number of chords needed to approximate a circular arc of `radius` spanning `sweep` radians."""
+    if radius <= 0:
+        return min_segments
+    return curve_segments(radius * abs(sweep), 1 / radius, tolerance, min_segments)
@@ -0,0 +1,134 @@
+"""
+AlponaGen v1.1
+---------------------
+Hand-drawn "wobble" displacement pass.
+
+Instead of jittering points inside every `draw_*` loop, a layer is drawn into
+a `WobbleDraw`, which buffers the shapes. When the layer is finished all of
+its vertices are displaced in one NumPy pass by a smooth noise field and the
+shapes are replayed onto the real `ImageDraw`.
+
+The noise field is two tileable lattices of random values, sampled with
+smoothstep-weighted bilinear interpolation. The lattices are built once per
+seed and reused; every image only picks a random offset into them.
+
+Author: Aritro Shome
+Date: 2025-10-09
+"""
+
+from itertools import chain
+import numpy as np
+
+from utils import peek_rng
+
+TABLE_SIZE = 256        # lattice cells per side, must be a power of two
+DEFAULT_SCALE = 40.0    # pixels per lattice cell; larger = slower, broader wobble
+
+_tables = {}
+
+
+def noise_tables(seed=0):
+    """Return the cached `(dx, dy)` lattices of uniform values in [-1, 1] for `seed`."""
+    if seed not in _tables:
+        rng = np.random.default_rng(seed)
+        _tables[seed] = rng.uniform(-1.0, 1.0, size=(2, TABLE_SIZE, TABLE_SIZE)).astype(np.float32)
+    return _tables[seed]
+
+
+def displace(points, amplitude, scale=DEFAULT_SCALE, offset=(0.0, 0.0), seed=0):
+    """
+    Return `points` (an (N, 2) array) moved by up to `amplitude` pixels along
+    a smooth noise field. Equal input points get equal displacements, so
+    shared vertices and closed outlines stay connected.
+    """
+    tables = noise_tables(seed).reshape(2, -1)
+    mask = TABLE_SIZE - 1
+
+    u = (points[:, 0] + offset[0]) / scale
+    v = (points[:, 1] + offset[1]) / scale
+    i0 = np.floor(u).astype(np.int64)
+    j0 = np.floor(v).astype(np.int64)
+    fu = u - i0
+    fv = v - j0
+    fu = fu * fu * (3 - 2 * fu)
+    fv = fv * fv * (3 - 2 * fv)
+    i0 &= mask
+    j0 &= mask
+    i1 = (i0 + 1) & mask
+    j0 *= TABLE_SIZE
+    j1 = (j0 + TABLE_SIZE) & (TABLE_SIZE * TABLE_SIZE - 1)
+
+    # index the flattened lattices, which is cheaper than 2-D fancy indexing
+    top = tables[:, j0 + i0] * (1 - fu) + tables[:, j0 + i1] * fu
+    bottom = tables[:, j1 + i0] * (1 - fu) + tables[:, j1 + i1] * fu
+    delta = top * (1 - fv) + bottom * fv
+    return points + amplitude * delta.T
+
+
+def random_offset(scale=DEFAULT_SCALE):
+    """
+    Pick an offset into the noise tables from the current `random` state
+    without advancing it, so turning wobble on does not change the design.
+    """
+    rng = peek_rng()
+    return (rng.uniform(0, TABLE_SIZE * scale), rng.uniform(0, TABLE_SIZE * scale))
+
+
+class WobbleDraw:
+    """
+    Stand-in for `ImageDraw` that buffers `line`, `polygon` and `ellipse`
+    calls until `flush`, then draws them with displaced vertices.
+
+    Vertices are buffered as one flat coordinate list and converted to a
+    single array per flush, so buffering a shape costs no NumPy call.
+    Ellipses stay native `ellipse` calls: their centre and top point are
+    displaced like any vertex, so a ring drifts with the field and its radii
+    change by the distance between the two, without being tessellated into
+    (much slower) wide polylines. Any other drawing call flushes the buffer
+    first and is passed straight through, which keeps the drawing order intact.
+    """
+
+    def __init__(self, draw, amplitude, offset=(0.0, 0.0), scale=DEFAULT_SCALE, seed=0):
+        self._draw = draw
+        self.amplitude = amplitude
+        self.offset = offset
+        self.scale = scale
+        self.seed = seed
+        self._coords = []   # flat x, y list of every buffered vertex
+        self._shapes = []   # (kind, start, stop, kwargs, radii), start/stop in points
+
+    def _add(self, kind, xy, kwargs, radii=None):
+        start = len(self._coords) // 2
+        self._coords.extend(chain.from_iterable(xy))
+        self._shapes.append((kind, start, len(self._coords) // 2, kwargs, radii))
+
+    def line(self, xy, **kwargs):
+        self._add("line", xy, kwargs)
+
+    def polygon(self, xy, **kwargs):
+        self._add("polygon", xy, kwargs)
+
+    def ellipse(self, xy, **kwargs):
+        (x0, y0), (x1, y1) = xy if len(xy) == 2 else (xy[:2], xy[2:])
+        cx, cy = (x0 + x1) / 2, (y0 + y1) / 2
+        self._add("ellipse", ((cx, cy), (cx, y0)), kwargs, ((x1 - x0) / 2, (y1 - y0) / 2))
+
+    def flush(self):
+        """Displace every buffered vertex in one pass and draw the shapes."""
+        if not self._shapes:
+            return
+        points = np.array(self._coords, dtype=np.float64).reshape(-1, 2)
+        flat = displace(points, self.amplitude, self.scale, self.offset, self.seed).ravel().tolist()
+        for kind, start, stop, kwargs, radii in self._shapes:
+            xy = flat[2 * start:2 * stop]
+            if radii is not None:
+                cx, cy, _, top = xy
+                grow = (cy - top) - radii[1]
+                rx, ry = max(0.0, radii[0] + grow), max(0.0, radii[1] + grow)
+                xy = (cx - rx, cy - ry, cx + rx, cy + ry)
+            getattr(self._draw, kind)(xy, **kwargs)
+        self._coords, self._shapes = [], []
+
+    def __getattr__(self, name):
+        self.flush()
+        return getattr(self._draw, name)